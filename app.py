@@ -44,12 +44,13 @@ To run the application:
 # --- 1. LIBRARY IMPORTS ---
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import seaborn as sns
-import matplotlib.pyplot as plt
+import numpy as np
 import os
-from thefuzz import process
-import statsmodels.api as sm
+import io
+from collections import namedtuple
+from rapidfuzz import process, fuzz, utils as rf_utils
+
+from utils.columns import RENAME_MAP, TEXT_COLUMN_KEYWORDS, standardize_columns
 
 # --- 2. PAGE CONFIGURATION ---
 st.set_page_config(
@@ -60,62 +61,227 @@ st.set_page_config(
 
 
 # --- 3. HELPER FUNCTIONS ---
-def standardize_columns(dataframe):
+@st.cache_data(show_spinner=False)
+def load_and_standardize(file_bytes):
+    """
+    Parses the uploaded CSV content and standardizes its columns. The parse
+    runs through pyarrow's multithreaded CSV reader, restricted to the columns
+    the pipeline recognizes (string for country/region, float32 for the report
+    metrics), and the result is cached on the raw bytes so widget-triggered
+    reruns reuse the already-parsed DataFrame.
+    """
+    import pyarrow as pa
+    import pyarrow.csv as pv
+
+    header = pd.read_csv(io.BytesIO(file_bytes), nrows=0).columns
+    all_keywords = [keyword for keywords in RENAME_MAP.values() for keyword in keywords]
+    # Columns already bearing the standardized names are recognized too, so a
+    # file in the app's own output format (e.g. the corrupt_data.py one) does
+    # not lose the columns whose keywords only match the raw report headers.
+    standard_names = {name.lower() for name in RENAME_MAP}
+    text_names = {name.lower() for name, keywords in RENAME_MAP.items()
+                  if any(keyword in TEXT_COLUMN_KEYWORDS for keyword in keywords)}
+    wanted = []
+    column_types = {}
+    for col in header:
+        clean = col.lower().strip().replace('explained by: ', '')
+        if any(keyword in clean for keyword in all_keywords) or clean in standard_names:
+            wanted.append(col)
+            if any(keyword in clean for keyword in TEXT_COLUMN_KEYWORDS) or clean in text_names:
+                column_types[col] = pa.string()
+            else:
+                column_types[col] = pa.float32()
+    if wanted:
+        convert_options = pv.ConvertOptions(include_columns=wanted, column_types=column_types)
+    else:
+        # Unrecognized format - fall back to a full parse with inferred types.
+        convert_options = None
+    table = pv.read_csv(io.BytesIO(file_bytes),
+                        read_options=pv.ReadOptions(use_threads=True),
+                        convert_options=convert_options)
+    return standardize_columns(table.to_pandas())
+
+
+@st.cache_data(show_spinner=False)
+def fuzzy_map_countries(countries, canonical_names, canonical_normalized):
+    """
+    Matches raw country names against the canonical list and returns the
+    (mapping, unmatched) pair. Cached on the country/canonical tuples, so the
+    expensive fuzzy scoring only runs when the underlying data changes, not on
+    every Streamlit rerun. Expects the pre-normalized canonical names from
+    load_lookup_data so RapidFuzz does not re-normalize the candidate list.
+    """
+    canon_exact = set(canonical_names)
+    canon_by_normalized = dict(zip(canonical_normalized, canonical_names))
+    mapping = {}
+    unmatched = []
+    # Fast path: most names already equal their canonical form (exactly or
+    # after normalization), so resolve those with O(1) dict lookups and only
+    # send the leftovers to the Levenshtein scorer.
+    fuzzy_countries = []
+    fuzzy_queries = []
+    for country in countries:
+        cleaned = country.replace('*', '').strip()
+        if cleaned in canon_exact:
+            mapping[country] = cleaned
+            continue
+        normalized = rf_utils.default_process(cleaned)
+        if normalized in canon_by_normalized:
+            mapping[country] = canon_by_normalized[normalized]
+            continue
+        fuzzy_countries.append(country)
+        fuzzy_queries.append(normalized)
+    if fuzzy_queries:
+        # workers=-1 fans the scoring out over rapidfuzz's internal thread
+        # pool; uint8 is plenty for 0-100 scores and shrinks the matrix 8x.
+        scores = process.cdist(fuzzy_queries, list(canonical_normalized), scorer=fuzz.WRatio,
+                               processor=None, score_cutoff=90.0, workers=-1, dtype=np.uint8)
+        best_idx = scores.argmax(axis=1)
+        best_score = scores.max(axis=1)
+        for i, country in enumerate(fuzzy_countries):
+            if best_score[i] >= 90:
+                mapping[country] = canonical_names[best_idx[i]]
+            else:
+                unmatched.append(country)
+    return mapping, unmatched
+
+
+@st.cache_data(show_spinner=False)
+def build_choropleth(frame):
     """
-    Creates a new, clean DataFrame by standardizing column names from various
-    report versions. It prioritizes columns prefixed with "Explained by:" to
-    handle semantically duplicate columns (e.g., in the 2023 report).
+    Builds and caches the world-map figure. Keyed on the plotted subset, so
+    reruns that do not change the countries/scores reuse the existing figure
+    instead of reconstructing it through plotly.express. Plotting by
+    precomputed ISO3 code skips plotly's per-render country-name resolver.
     """
-    df_original = dataframe.copy()
-    rename_map = {
-        'Country': ['country'], 'Region': ['regional indicator'],
-        'Happiness Score': ['happiness score', 'ladder score'], 'GDP per capita': ['gdp per capita'],
-        'Social Support': ['social support'], 'Life Expectancy': ['healthy life expectancy'],
-        'Freedom': ['freedom to make life choices'], 'Generosity': ['generosity'],
-        'Corruption': ['perceptions of corruption']
-    }
-    df_clean = pd.DataFrame()
-    processed_original_cols = set()
-    for standard_name, keywords in rename_map.items():
-        best_match_col = None
-        # First pass: prioritize "Explained by:" columns
-        for col_original in df_original.columns:
-            if col_original in processed_original_cols: continue
-            if col_original.lower().strip().startswith("explained by:"):
-                col_clean_name = col_original.lower().replace('explained by: ', '').strip()
-                if any(keyword in col_clean_name for keyword in keywords):
-                    best_match_col = col_original
-                    break
-        # Second pass: if no priority match found, search all columns
-        if not best_match_col:
-            for col_original in df_original.columns:
-                if col_original in processed_original_cols: continue
-                col_clean_name = col_original.lower().strip()
-                if any(keyword in col_clean_name for keyword in keywords):
-                    best_match_col = col_original
-                    break
-        # If a match was found, copy the data to the new clean DataFrame
-        if best_match_col:
-            df_clean[standard_name] = df_original[best_match_col]
-            processed_original_cols.add(best_match_col)
-    # Copy any remaining, unmapped columns to the new DataFrame
-    for col in df_original.columns:
-        if col not in processed_original_cols:
-            df_clean[col] = df_original[col]
-    return df_clean
+    import plotly.express as px
+    return px.choropleth(frame, locations='iso_alpha', locationmode='ISO-3',
+                         color='Happiness Score', hover_name='Country',
+                         color_continuous_scale=px.colors.sequential.Plasma,
+                         title='Worldwide Happiness Score Distribution')
+
+
+@st.cache_data(show_spinner=False)
+def build_scatter(frame):
+    """
+    Builds and caches the GDP-vs-happiness scatter. The trendline is fitted
+    directly with np.polyfit and added as a plain line trace, which avoids the
+    statsmodels fit plotly.express runs for trendline='ols'.
+    """
+    import plotly.express as px
+    fig = px.scatter(frame, x='GDP per capita', y='Happiness Score', hover_name='Country',
+                     title='Relationship between GDP per Capita and Happiness')
+    x = frame['GDP per capita'].to_numpy(dtype=float)
+    y = frame['Happiness Score'].to_numpy(dtype=float)
+    valid = ~(np.isnan(x) | np.isnan(y))
+    if valid.sum() > 1 and x[valid].var() > 0:
+        slope, intercept = np.polyfit(x[valid], y[valid], 1)
+        x_line = np.array([x[valid].min(), x[valid].max()])
+        fig.add_scatter(x=x_line, y=slope * x_line + intercept, mode='lines',
+                        name='OLS trendline', showlegend=False)
+    return fig
+
+
+@st.cache_data(show_spinner=False)
+def analyze_gdp_relationship(frame):
+    """
+    Computes the GDP-happiness correlation and the top positive/negative
+    outlier countries in one closed-form pass (no separate .corr() call plus a
+    statsmodels OLS fit over identical data). Cached on the analyzed columns,
+    so reruns with an unchanged filter selection skip the recomputation.
+    """
+    x = frame['GDP per capita'].to_numpy(dtype=float)
+    y = frame['Happiness Score'].to_numpy(dtype=float)
+    valid = ~(np.isnan(x) | np.isnan(y))
+    x, y = x[valid], y[valid]
+    correlation = float('nan')
+    happiest = unhappiest = None
+    x_var = x.var() if len(x) > 1 else 0.0
+    y_var = y.var() if len(x) > 1 else 0.0
+    if x_var > 0 and y_var > 0:
+        x_mean, y_mean = x.mean(), y.mean()
+        covariance = ((x - x_mean) * (y - y_mean)).mean()
+        correlation = covariance / np.sqrt(x_var * y_var)
+        # Closed-form simple regression reusing the stats above
+        slope = covariance / x_var
+        intercept = y_mean - slope * x_mean
+        residuals = y - (slope * x + intercept)
+        countries = frame['Country'].to_numpy()[valid]
+        happiest = countries[residuals.argmax()]
+        unhappiest = countries[residuals.argmin()]
+    return correlation, happiest, unhappiest
+
+
+@st.cache_data(show_spinner=False)
+def compute_correlation_matrix(frame):
+    """
+    Computes and caches the correlation matrix for the given numeric columns,
+    so reruns with an unchanged filter selection skip the recomputation.
+    """
+    return frame.corr()
+
+
+@st.cache_data(show_spinner=False)
+def build_heatmap(correlation_matrix):
+    """
+    Builds and caches the correlation heatmap figure for a given matrix, so
+    reruns with unchanged correlations skip the figure construction too.
+    """
+    import plotly.express as px
+    return px.imshow(correlation_matrix, text_auto='.2f',
+                     color_continuous_scale='RdBu_r', aspect='auto',
+                     title='Correlation Matrix of Happiness Factors')
+
+
+# Cached bundle of the lookup table and the derived structures the matching
+# and enrichment stages need on every rerun.
+LookupData = namedtuple('LookupData', ['df', 'canonical_names', 'canonical_normalized', 'region_map', 'iso_map'])
+
+
+# Canonical names pycountry cannot resolve (or, for Kosovo, fuzzy-resolves to
+# the wrong country); checked before the library so these countries still get
+# their own spot on the map.
+ISO3_ALIASES = {
+    'Congo (Brazzaville)': 'COG',
+    'Congo (Kinshasa)': 'COD',
+    'Hong Kong S.A.R. of China': 'HKG',
+    'Ivory Coast': 'CIV',
+    'Kosovo': 'XKX',
+    'Taiwan Province of China': 'TWN',
+}
+
+
+def resolve_iso3(name):
+    """Best-effort ISO-3166 alpha-3 code resolution for a country name."""
+    if name in ISO3_ALIASES:
+        return ISO3_ALIASES[name]
+    import pycountry
+    try:
+        return pycountry.countries.lookup(name).alpha_3
+    except LookupError:
+        try:
+            return pycountry.countries.search_fuzzy(name)[0].alpha_3
+        except LookupError:
+            return None
 
 
 @st.cache_data
 def load_lookup_data():
     """
     Loads and caches the master country-region lookup file to avoid re-reading
-    it from disk on every script rerun.
+    it from disk on every script rerun. Also precomputes the canonical-name
+    tuple, its RapidFuzz-normalized variant, the name->region dict, and the
+    name->ISO3 dict so those are built once instead of per rerun.
     """
     try:
         lookup_path = os.path.join('data', 'country_region_lookup.csv')
         df_lookup = pd.read_csv(lookup_path)
         df_lookup.dropna(subset=['region'], inplace=True)
-        return df_lookup
+        canonical_names = tuple(df_lookup['canonical_name'])
+        canonical_normalized = tuple(rf_utils.default_process(name) for name in canonical_names)
+        region_map = dict(zip(df_lookup['canonical_name'], df_lookup['region']))
+        iso_map = {name: resolve_iso3(name) for name in canonical_names}
+        return LookupData(df_lookup, canonical_names, canonical_normalized, region_map, iso_map)
     except FileNotFoundError:
         st.error(
             "Master lookup file 'data/country_region_lookup.csv' not found! Please run 'scripts/create_lookup.py'.")
@@ -138,40 +304,43 @@ if 'data_cleaned' not in st.session_state:
 # Reset the cleaning state if a new file is uploaded
 if uploaded_file and uploaded_file.name != st.session_state.get('last_file_name', ''):
     st.session_state.data_cleaned = False
+    st.session_state.pop('manual_mapping', None)
     st.session_state.last_file_name = uploaded_file.name
 
 # --- 6. MAIN DATA PROCESSING AND VISUALIZATION WORKFLOW ---
 if uploaded_file is not None:
-    df_lookup = load_lookup_data()
+    lookup = load_lookup_data()
 
-    if df_lookup is not None:
+    if lookup is not None:
         # --- Stage 1: Initial Data Loading and Standardization ---
-        df_raw = pd.read_csv(uploaded_file)
-        df_processed = standardize_columns(df_raw)
-
-        canonical_names = df_lookup['canonical_name'].tolist()
-
-        # --- Stage 2: Country Name Matching (Automatic) ---
-        unmatched_countries = []
-        mapping = {}
-        for country in df_processed['Country'].dropna().unique():
-            cleaned_name = country.replace('*', '').strip()
-            match = process.extractOne(cleaned_name, canonical_names, score_cutoff=90)
-            if match:
-                mapping[country] = match[0]
-            else:
-                unmatched_countries.append(country)
+        df_processed = load_and_standardize(uploaded_file.getvalue())
+
+        canonical_names = list(lookup.canonical_names)
 
-        df_processed['canonical_name'] = df_processed['Country'].map(mapping)
+        # --- Stage 2: Country Name Matching (Automatic, cached) ---
+        # Score all countries against all canonical names in a single vectorized
+        # C++ call (RapidFuzz) instead of one extractOne() per country.
+        mapping, unmatched_countries = fuzzy_map_countries(
+            tuple(sorted(df_processed['Country'].dropna().unique())),
+            lookup.canonical_names, lookup.canonical_normalized)
 
         # --- Stage 3: Interactive User Review for Unmatched Countries ---
         if unmatched_countries and not st.session_state.data_cleaned:
             with st.expander("⚠️ Unrecognized Countries Review - Action Required!", expanded=True):
                 st.warning("Could not automatically match all country names. Please review the suggestions below.")
                 user_choices = {}
-                for country in unmatched_countries:
-                    cleaned_name = country.replace('*', '').strip()
-                    best_guesses = [guess[0] for guess in process.extract(cleaned_name, canonical_names, limit=3)]
+                # One cdist call scores every unmatched name against all
+                # pre-normalized candidates at once; argpartition then pulls
+                # each row's top-3 suggestions without a full sort.
+                queries = [rf_utils.default_process(country.replace('*', '').strip())
+                           for country in unmatched_countries]
+                suggestion_scores = process.cdist(queries, list(lookup.canonical_normalized),
+                                                  scorer=fuzz.WRatio, processor=None, workers=-1)
+                top_idx = np.argpartition(suggestion_scores, -3, axis=1)[:, -3:]
+                row_order = np.argsort(np.take_along_axis(suggestion_scores, top_idx, axis=1), axis=1)[:, ::-1]
+                top_idx = np.take_along_axis(top_idx, row_order, axis=1)
+                for row, country in enumerate(unmatched_countries):
+                    best_guesses = [canonical_names[j] for j in top_idx[row]]
                     options = best_guesses + ["(Skip / Keep Original Name)"]
                     user_choices[country] = st.selectbox(f"Select the correct match for **'{country}'**:", options,
                                                          index=0, key=f"select_{country}")
@@ -194,8 +363,12 @@ if uploaded_file is not None:
                             st.write(
                                 f"- The name **'{dup_name}'** was chosen for: `{', '.join(conflicting_originals)}`")
                     else:
-                        # If no conflicts, apply mapping and set state
-                        df_processed['canonical_name'] = df_processed['Country'].map(final_mapping)
+                        # If no conflicts, remember the manual choices and set
+                        # state - the DataFrame itself is only touched once,
+                        # during the enrichment stage below.
+                        st.session_state.manual_mapping = {
+                            original: choice for original, choice in user_choices.items()
+                            if choice != "(Skip / Keep Original Name)"}
                         st.session_state.data_cleaned = True
                         st.success("Matches applied successfully! No conflicts found.")
                         st.rerun()
@@ -205,52 +378,92 @@ if uploaded_file is not None:
         # --- Stage 4: Final Data Enrichment and Display (if cleaning is complete) ---
         if st.session_state.data_cleaned:
             st.header("Step 2: Data Processing Pipeline")
-            # Finalize country names
-            df_processed['canonical_name'].fillna(df_processed['Country'], inplace=True)
-
-            # Enrich with region data from lookup, ensuring only one 'Region' column
-            if 'Region' in df_processed.columns: df_processed = df_processed.drop(columns=['Region'])
-            df_enriched = pd.merge(df_processed, df_lookup, on='canonical_name', how='left')
-
-            # Final cleanup
-            df_enriched['Country'] = df_enriched['canonical_name']
-            df_enriched.rename(columns={'region': 'Region'}, inplace=True)
-            df_enriched.drop(columns=['canonical_name'], inplace=True)
-            df_enriched['Region'].fillna('Unknown', inplace=True)
-            df_processed = df_enriched
+            # Finalize country names: materialize the canonical names once,
+            # folding in any manual review choices stored for this file
+            effective_mapping = {**mapping, **st.session_state.get('manual_mapping', {})}
+            # Complete the mapping (unmatched names map to themselves) so one
+            # .map pass suffices - no temporary NaN Series plus fillna
+            for name in df_processed['Country'].dropna().unique():
+                effective_mapping.setdefault(name, name)
+            canonical = df_processed['Country'].map(effective_mapping)
+
+            # Enrich with region data via a dict lookup - attaching one column
+            # with .map avoids the hash-join and frame reallocation of pd.merge
+            # Categorical dtype: Region has low cardinality, and the sidebar
+            # filter below compares integer category codes instead of strings
+            df_processed['Region'] = canonical.map(lookup.region_map).fillna('Unknown').astype('category')
+            df_processed['Country'] = canonical
 
             # --- Stage 4a: Missing Value Imputation ---
             st.subheader("Missing Value Handling")
-            missing_values = df_processed.isnull().sum()
+            # Materialize the null mask once and reuse it for the per-column
+            # counts, the affected-rows selection, and the drop strategy.
+            # Taken before the derived iso_alpha helper column is attached:
+            # an unresolvable ISO code is not missing report data and must not
+            # trigger the warning or get a country dropped.
+            null_mask = df_processed.isna()
+            df_processed['iso_alpha'] = canonical.map(lookup.iso_map)
+            missing_values = null_mask.sum()
             missing_values = missing_values[missing_values > 0]
             if not missing_values.empty:
                 st.warning("Missing data detected! The table below shows the affected entries.")
-                rows_with_missing = df_processed[df_processed.isnull().any(axis=1)]
+                rows_with_missing = df_processed[null_mask[missing_values.index].any(axis=1)]
                 cols_with_missing = missing_values.index.tolist()
                 if 'Country' in df_processed.columns and 'Country' not in cols_with_missing:
                     cols_with_missing.insert(0, 'Country')
                 st.dataframe(rows_with_missing[cols_with_missing].reset_index(drop=True))
                 strategy = st.radio("Choose an imputation strategy:",
                                     ('Fill with Median (recommended)', 'Fill with Mean', 'Drop Rows with Missing Data'))
-                df_cleaned = df_processed.copy()
-                for col in missing_values.index:
-                    if pd.api.types.is_numeric_dtype(df_cleaned[col]):
-                        if strategy == 'Fill with Median (recommended)':
-                            df_cleaned[col].fillna(df_cleaned[col].median(), inplace=True)
-                        elif strategy == 'Fill with Mean':
-                            df_cleaned[col].fillna(df_cleaned[col].mean(), inplace=True)
-                if strategy == 'Drop Rows with Missing Data': df_cleaned.dropna(inplace=True)
+            else:
+                strategy = None
+
+            # Reuse the cleaned frame stored on the previous rerun when the
+            # file and strategy are unchanged - widget interactions elsewhere
+            # (e.g. the region filter) then skip the imputation work entirely.
+            cleaned_key = (uploaded_file.name, strategy)
+            if st.session_state.get('cleaned_key') == cleaned_key:
+                df_cleaned = st.session_state['df_cleaned']
+            else:
+                if strategy is None:
+                    df_cleaned = df_processed.copy()
+                elif strategy == 'Drop Rows with Missing Data':
+                    # Reuse the precomputed mask so iso_alpha gaps never
+                    # delete an otherwise fully-populated country
+                    df_cleaned = df_processed[~null_mask.any(axis=1)]
+                else:
+                    # One vectorized fillna with a per-column stats Series
+                    # instead of a Python loop of inplace ops per column.
+                    if strategy == 'Fill with Median (recommended)':
+                        fill_values = df_processed.median(numeric_only=True)
+                    else:
+                        fill_values = df_processed.mean(numeric_only=True)
+                    df_cleaned = df_processed.fillna(fill_values)
+                st.session_state['df_cleaned'] = df_cleaned
+                st.session_state['cleaned_key'] = cleaned_key
+
+            if strategy is not None:
                 st.success(f"Strategy applied: **{strategy}**. Data has been cleaned.")
             else:
                 st.info("No missing values found in the data.")
-                df_cleaned = df_processed.copy()
+
+            # Downcast any remaining float64 columns (e.g. from the fallback
+            # full-inference parse) so the correlation, OLS, and plotting
+            # stages below work on half the bytes.
+            float64_cols = df_cleaned.select_dtypes(include='float64').columns
+            if len(float64_cols) > 0:
+                df_cleaned[float64_cols] = df_cleaned[float64_cols].astype('float32')
 
             # --- Stage 4b: Sidebar Filtering ---
             st.sidebar.header("Filter Options")
             if 'Region' in df_cleaned.columns and df_cleaned['Region'].nunique() > 1:
-                all_regions = sorted([str(region) for region in df_cleaned['Region'].unique() if pd.notna(region)])
+                categories = df_cleaned['Region'].cat.categories
+                all_regions = sorted(str(region) for region in categories)
                 selected_regions = st.sidebar.multiselect("Filter by region:", options=all_regions, default=all_regions)
-                df_filtered = df_cleaned[df_cleaned['Region'].isin(selected_regions)]
+                # Filter on the int8 category codes with a NumPy mask - much
+                # cheaper than hashing the region string of every row
+                selected_codes = categories.get_indexer(selected_regions)
+                mask = np.isin(df_cleaned['Region'].cat.codes.to_numpy(), selected_codes)
+                df_filtered = df_cleaned[mask]
             else:
                 df_filtered = df_cleaned
 
@@ -260,20 +473,17 @@ if uploaded_file is not None:
             st.dataframe(df_filtered, height=300, use_container_width=True)
 
             st.subheader("Global Happiness Map")
-            fig_map = px.choropleth(df_filtered, locations='Country', locationmode='country names',
-                                    color='Happiness Score', hover_name='Country',
-                                    color_continuous_scale=px.colors.sequential.Plasma,
-                                    title='Worldwide Happiness Score Distribution')
+            fig_map = build_choropleth(df_filtered[['Country', 'iso_alpha', 'Happiness Score']])
             st.plotly_chart(fig_map, use_container_width=True)
 
             st.subheader("GDP per Capita vs. Happiness Score")
-            fig_scatter = px.scatter(df_filtered, x='GDP per capita', y='Happiness Score', hover_name='Country',
-                                     title='Relationship between GDP per Capita and Happiness', trendline='ols')
+            fig_scatter = build_scatter(df_filtered[['Country', 'GDP per capita', 'Happiness Score']])
             st.plotly_chart(fig_scatter, use_container_width=True)
 
             with st.container(border=True):
                 st.markdown("#### 🤖 Automated Chart Analysis")
-                correlation = df_filtered['GDP per capita'].corr(df_filtered['Happiness Score'])
+                correlation, happiest_country, unhappiest_country = analyze_gdp_relationship(
+                    df_filtered[['Country', 'GDP per capita', 'Happiness Score']])
 
 
                 def interpret_correlation(c):
@@ -289,16 +499,7 @@ if uploaded_file is not None:
 
                 st.info(interpret_correlation(correlation))
 
-                X = df_filtered['GDP per capita'].dropna()
-                y = df_filtered.loc[X.index, 'Happiness Score'].dropna()
-                X = sm.add_constant(X)
-                if len(X) > 1:
-                    model = sm.OLS(y, X).fit()
-                    residuals = model.resid
-                    happiest_for_gdp_idx = residuals.idxmax()
-                    unhappiest_for_gdp_idx = residuals.idxmin()
-                    happiest_country = df_filtered.loc[happiest_for_gdp_idx, 'Country']
-                    unhappiest_country = df_filtered.loc[unhappiest_for_gdp_idx, 'Country']
+                if happiest_country is not None:
                     st.markdown(f"""
                     - **Top Positive Outlier:** **{happiest_country}** is significantly happier than its GDP level would predict.
                     - **Top Negative Outlier:** **{unhappiest_country}** is less happy than its GDP level would suggest.
@@ -309,11 +510,9 @@ if uploaded_file is not None:
                             'Generosity', 'Corruption']
             existing_cols = [col for col in numeric_cols if col in df_filtered.columns]
             if len(existing_cols) > 1:
-                correlation_matrix = df_filtered[existing_cols].corr()
-                fig_heatmap, ax = plt.subplots(figsize=(10, 8))
-                sns.heatmap(correlation_matrix, annot=True, cmap='coolwarm', fmt='.2f', ax=ax)
-                ax.set_title('Correlation Matrix of Happiness Factors')
-                st.pyplot(fig_heatmap)
+                correlation_matrix = compute_correlation_matrix(df_filtered[existing_cols])
+                fig_heatmap = build_heatmap(correlation_matrix)
+                st.plotly_chart(fig_heatmap, use_container_width=True)
 
                 with st.container(border=True):
                     st.markdown("#### 🤖 Automated Factor Ranking")
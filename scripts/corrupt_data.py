@@ -27,6 +27,20 @@ $ python scripts/corrupt_data.py
 import pandas as pd
 import numpy as np
 import os
+import sys
+
+# Make the project root importable so the shared helpers in `utils` resolve
+# regardless of where the script is launched from.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from utils.columns import standardize_columns
+
+# Use the multithreaded Arrow CSV reader with Arrow-backed dtypes when
+# pyarrow is available; fall back to the default C engine otherwise.
+try:
+    import pyarrow  # noqa: F401
+    READ_CSV_KWARGS = {'engine': 'pyarrow', 'dtype_backend': 'pyarrow'}
+except ImportError:
+    READ_CSV_KWARGS = {}
 
 # --- CONFIGURATION ---
 # Use this section to control the script's behavior.
@@ -50,45 +64,9 @@ COLUMNS_TO_CORRUPT = [
 # For example, 0.1 means 10% of the data will be removed.
 CORRUPTION_PERCENTAGE = 0.1
 
-
-# --- HELPER FUNCTION (copied from app.py for consistency) ---
-def standardize_columns(dataframe):
-    """
-    Standardizes column names to ensure consistency with the main app.
-    This allows `COLUMNS_TO_CORRUPT` to use clean names.
-    """
-    df_original = dataframe.copy()
-    rename_map = {
-        'Country': ['country'], 'Region': ['regional indicator'],
-        'Happiness Score': ['happiness score', 'ladder score'], 'GDP per capita': ['gdp per capita'],
-        'Social Support': ['social support'], 'Life Expectancy': ['healthy life expectancy'],
-        'Freedom': ['freedom to make life choices'], 'Generosity': ['generosity'],
-        'Corruption': ['perceptions of corruption']
-    }
-    df_clean = pd.DataFrame()
-    processed_original_cols = set()
-    for standard_name, keywords in rename_map.items():
-        best_match_col = None
-        for col_original in df_original.columns:
-            if col_original in processed_original_cols: continue
-            if col_original.lower().strip().startswith("explained by:"):
-                col_clean = col_original.lower().replace('explained by: ', '').strip()
-                if any(keyword in col_clean for keyword in keywords):
-                    best_match_col = col_original
-                    break
-        if not best_match_col:
-            for col_original in df_original.columns:
-                if col_original in processed_original_cols: continue
-                col_clean = col_original.lower().strip()
-                if any(keyword in col_clean for keyword in keywords):
-                    best_match_col = col_original
-                    break
-        if best_match_col:
-            df_clean[standard_name] = df_original[best_match_col]
-            processed_original_cols.add(best_match_col)
-    for col in df_original.columns:
-        if col not in processed_original_cols: df_clean[col] = df_original[col]
-    return df_clean
+# Seeded PCG64 generator - faster than the legacy np.random API and makes the
+# corrupted output reproducible across runs.
+rng = np.random.default_rng(seed=42)
 
 
 # --- MAIN SCRIPT LOGIC ---
@@ -101,7 +79,7 @@ def corrupt_csv(source_path, output_path, columns_to_corrupt, percentage):
         print(f"[!] ERROR: Source file not found at path: {source_path}")
         return
 
-    df = pd.read_csv(source_path)
+    df = pd.read_csv(source_path, **READ_CSV_KWARGS)
 
     # Standardize columns first to find the correct ones
     df_standardized = standardize_columns(df)
@@ -113,23 +91,22 @@ def corrupt_csv(source_path, output_path, columns_to_corrupt, percentage):
             # Calculate the number of values to remove
             n_to_remove = int(len(df_standardized) * percentage)
 
-            # Get indices of rows that do not already have missing values in this column
-            valid_indices = df_standardized[col].dropna().index
+            # Positional indices of rows that still hold a value in this column
+            valid_indices = np.flatnonzero(df_standardized[col].notna().to_numpy())
 
-            if len(valid_indices) < n_to_remove:
+            if valid_indices.size < n_to_remove:
                 print(
-                    f"[*] Warning: Not enough non-null data in column '{col}' to remove {n_to_remove} values. Removing {len(valid_indices)} instead.")
-                n_to_remove = len(valid_indices)
+                    f"[*] Warning: Not enough non-null data in column '{col}' to remove {n_to_remove} values. Removing {valid_indices.size} instead.")
+                n_to_remove = valid_indices.size
 
             if n_to_remove == 0:
                 print(f"    - No values to remove in column '{col}'. Skipping.")
                 continue
 
-            # Randomly choose indices to set to NaN
-            indices_to_remove = np.random.choice(valid_indices, n_to_remove, replace=False)
-
-            # Replace the values with NaN (Not a Number)
-            df_standardized.loc[indices_to_remove, col] = np.nan
+            # Randomly choose positions and set them to NaN (Not a Number);
+            # iloc with integer positions skips the label-based .loc lookup
+            indices_to_remove = rng.choice(valid_indices, n_to_remove, replace=False)
+            df_standardized.iloc[indices_to_remove, df_standardized.columns.get_loc(col)] = np.nan
             print(f"    - In column '{col}', removed {n_to_remove} values.")
         else:
             print(f"[!] Warning: Column '{col}' not found in the standardized file. Skipping.")
@@ -0,0 +1,89 @@
+"""
+================================================================================
+Shared Column Standardization (utils/columns.py)
+================================================================================
+
+Single home for the column-standardization logic used by both the main
+application (`app.py`) and the data-preparation scripts. Previously the
+function was copy-pasted across modules, so fixes and optimizations had to be
+applied twice and the copies risked drifting apart.
+
+The rename plan (which original column maps to which standard name, and the
+final column order) only depends on the column signature of the input file.
+Since the yearly WHR files share a handful of schemas, the plan is memoized
+per signature and repeated calls skip the keyword matching entirely.
+================================================================================
+"""
+from functools import lru_cache
+
+# Maps each standardized column name to the keywords used to recognize it in
+# the various yearly report formats.
+RENAME_MAP = {
+    'Country': ['country'], 'Region': ['regional indicator'],
+    'Happiness Score': ['happiness score', 'ladder score'], 'GDP per capita': ['gdp per capita'],
+    'Social Support': ['social support'], 'Life Expectancy': ['healthy life expectancy'],
+    'Freedom': ['freedom to make life choices'], 'Generosity': ['generosity'],
+    'Corruption': ['perceptions of corruption']
+}
+
+# Keywords identifying the text (non-numeric) columns among the ones above.
+TEXT_COLUMN_KEYWORDS = ['country', 'regional indicator']
+
+
+@lru_cache(maxsize=8)
+def _column_rename_plan(columns):
+    """
+    Computes the output plan for a given column signature: which source column
+    index feeds each output slot, and the final (unique) column names.
+    Normalizes every column name exactly once and matches each standard name
+    with a single pass over the precomputed lists.
+    """
+    cols = list(columns)
+    lower = [col.lower().strip() for col in cols]
+    explained_idx = [i for i, name in enumerate(lower) if name.startswith("explained by:")]
+    stripped = [name.replace('explained by: ', '') for name in lower]
+    used_idx = set()
+    order = []
+    names = []
+    slot_of = {}
+    for standard_name, keywords in RENAME_MAP.items():
+        # First pass: prioritize "Explained by:" columns
+        hit = next((i for i in explained_idx
+                    if i not in used_idx and any(keyword in stripped[i] for keyword in keywords)), None)
+        # Second pass: if no priority match found, search all columns
+        if hit is None:
+            hit = next((i for i in range(len(cols))
+                        if i not in used_idx and any(keyword in lower[i] for keyword in keywords)), None)
+        if hit is not None:
+            slot_of[standard_name] = len(order)
+            order.append(hit)
+            names.append(standard_name)
+            used_idx.add(hit)
+    for i, col in enumerate(cols):
+        if i in used_idx:
+            continue
+        if col in slot_of:
+            # An unmapped raw column sharing an already-assigned standard name
+            # (e.g. the raw 'Generosity' next to 'Explained by: Generosity' in
+            # the 2023 report) takes over that slot instead of duplicating the
+            # label, just as the sequential copy loop used to overwrite it.
+            order[slot_of[col]] = i
+        else:
+            slot_of[col] = len(order)
+            order.append(i)
+            names.append(col)
+    return tuple(order), tuple(names)
+
+
+def standardize_columns(dataframe):
+    """
+    Creates a new, clean DataFrame by standardizing column names from various
+    report versions. It prioritizes columns prefixed with "Explained by:" to
+    handle semantically duplicate columns (e.g., in the 2023 report).
+    """
+    order, names = _column_rename_plan(tuple(dataframe.columns))
+    # Select by position and relabel afterwards: matched standard names first,
+    # then the remaining columns in their original order. Label-based
+    # selection would expand any name shared between a renamed column and a
+    # surviving raw one into every matching column.
+    return dataframe.iloc[:, list(order)].set_axis(list(names), axis=1)